@@ -7,67 +7,388 @@ This module provides an HTTP server that:
 3. Returns consolidated JSON with tokens, AST, assembly, and hex dumps
 """
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from flask import Flask, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import RequestEntityTooLarge
+import base64
+import gzip
+import logging
+import logging.handlers
+import orjson
 import os
 import sys
+import threading
+import time
 
 # Add parent directory to path to import config and utils
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import Config
-from utils.compiler import CompilerInvoker
+from utils.cache import ResponseCache
+from utils.compiler import CompilerInvoker, new_hash
+
+
+class PeriodicMemoryHandler(logging.handlers.MemoryHandler):
+    """
+    MemoryHandler that also flushes its buffer every interval seconds.
+
+    Without the periodic flush, records below flushLevel would only be
+    written once capacity of them had piled up.
+    """
+
+    def __init__(self, capacity, interval, **kwargs):
+        super().__init__(capacity, **kwargs)
+        self.interval = interval
+        self._flusher_pid = None
+
+    def emit(self, record):
+        # Called with the handler lock held. The flusher thread is started
+        # lazily so that every forked gunicorn worker runs its own.
+        if self._flusher_pid != os.getpid():
+            self._flusher_pid = os.getpid()
+            threading.Thread(
+                target=self._flush_periodically, name="log-flush", daemon=True
+            ).start()
+        super().emit(record)
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+def configure_logging():
+    """
+    Send log records to stderr through a buffered handler.
+
+    Records are batched in memory and written together at least once a
+    second, flushing immediately for warnings and above, so workers don't
+    contend on stderr per request.
+    """
+    stream = logging.StreamHandler()
+    stream.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    )
+    buffered = PeriodicMemoryHandler(
+        capacity=1024, interval=1.0, flushLevel=logging.WARNING, target=stream
+    )
+    logging.basicConfig(level=Config.LOG_LEVEL, handlers=[buffered])
+
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson."""
+
+    # Never sort keys or pretty-print, even in debug mode
+    sort_keys = False
+    compact = True
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Let Werkzeug reject oversized bodies before they are read into memory,
+# allowing generous headroom over MAX_SOURCE_SIZE for JSON escaping
+app.config["MAX_CONTENT_LENGTH"] = Config.MAX_SOURCE_SIZE * 2
 
 # Configure CORS for React development server
 # Development: Allow localhost:3000 (React dev server)
 # Production: Should be restricted to specific domain
-cors_config = {
-    "origins": Config.CORS_ORIGINS,
-    "methods": ["GET", "POST", "OPTIONS"],
-    "allow_headers": ["Content-Type"],
-    "supports_credentials": False,
-    "max_age": 3600,  # Cache preflight requests for 1 hour
+# The headers are static for a single configured origin, so build them once
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": Config.CORS_ORIGINS,
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, If-None-Match",
+    "Access-Control-Expose-Headers": "ETag, X-Cache",
+    "Access-Control-Max-Age": "3600",  # Cache preflight requests for 1 hour
 }
 
-CORS(app, resources={r"/*": cors_config})
 
-# Initialize compiler invoker
-compiler = CompilerInvoker(Config.COMPILER_PATH)
+@app.after_request
+def add_cors_headers(response):
+    """Attach the precomputed CORS headers to every response."""
+    response.headers.update(CORS_HEADERS)
+    return response
+
+
+# Shared compiler invoker, built on first use by get_compiler()
+_compiler = None
+_compiler_lock = threading.Lock()
+
+
+def get_compiler():
+    """
+    Return the shared compiler invoker, creating it on first use.
+
+    Deferring construction lets the API start before the compiler is built;
+    a missing binary surfaces as FileNotFoundError on the first compile.
+    Concurrent first calls build a single invoker, so they share its
+    in-flight compile coalescing.
+    """
+    global _compiler
+    if _compiler is None:
+        with _compiler_lock:
+            if _compiler is None:
+                _compiler = CompilerInvoker(
+                    Config.COMPILER_PATH,
+                    temp_dir=Config.TEMP_DIR,
+                    cache_dir=Config.COMPILE_CACHE_DIR,
+                    cache_max_entries=Config.COMPILE_CACHE_MAX_ENTRIES,
+                )
+    return _compiler
+
+
+# Serialized /compile responses keyed by a digest (xxh3-128, or SHA-256
+# without xxhash) of the compiler build, the requested dumps and the source
+response_cache = ResponseCache(
+    maxsize=Config.RESPONSE_CACHE_SIZE,
+    redis_url=Config.REDIS_URL,
+    redis_ttl=Config.REDIS_CACHE_TTL,
+    redis_timeout=Config.REDIS_TIMEOUT,
+)
+
+
+def raw_json(blob):
+    """Embed an already-serialized JSON dump in a payload without re-parsing."""
+    return orjson.Fragment(blob) if blob else None
+
+
+def json_response(payload, status=200):
+    """Serialize payload with orjson and wrap it in a JSON response."""
+    return app.response_class(
+        orjson.dumps(payload), status=status, mimetype="application/json"
+    )
+
+
+# Response fields selectable via options.dumps, mapped to the
+# CompilerInvoker dump kinds that produce them
+DUMP_FIELDS = {
+    "tokens": "tokens",
+    "ast": "ast",
+    "assembly": "assembly",
+    "hexdump": "hex",
+}
+
+# Headers for views that return pre-serialized JSON bodies directly
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Every error response shares this envelope; only "error" varies
+ERROR_ENVELOPE = {"success": False}
+
+
+def error_response(message, status):
+    """Build a JSON error response from the shared error envelope."""
+    payload = ERROR_ENVELOPE.copy()
+    payload["error"] = message
+    return json_response(payload, status)
+
+
+# Error bodies with no variable parts are serialized once at import
+INVALID_JSON_BODY = orjson.dumps(
+    {**ERROR_ENVELOPE, "error": "Invalid JSON in request body"}
+)
+MISSING_SOURCE_BODY = orjson.dumps(
+    {**ERROR_ENVELOPE, "error": 'Missing "source" field in request body'}
+)
+EMPTY_SOURCE_BODY = orjson.dumps(
+    {**ERROR_ENVELOPE, "error": "Source code cannot be empty"}
+)
+REQUEST_TOO_LARGE_BODY = orjson.dumps(
+    {
+        **ERROR_ENVELOPE,
+        "error": f"Request body too large (max: {app.config['MAX_CONTENT_LENGTH']} bytes)",
+    }
+)
+
+# /health and /api/info only report static configuration, so their bodies
+# are serialized once at import instead of on every request
+HEALTH_BODY = orjson.dumps(
+    {
+        "status": "healthy",
+        "compiler_path": Config.COMPILER_PATH,
+        "compiler_exists": Config.compiler_exists(),
+    }
+)
+
+API_INFO_BODY = orjson.dumps(
+    {
+        "name": "C Compiler Visualization API",
+        "version": "1.0.0",
+        "endpoints": {
+            "/health": "GET - Health check",
+            "/compile": "POST - Compile C code and get visualization data",
+            "/api/info": "GET - API information",
+        },
+        "config": {
+            "compiler_path": Config.COMPILER_PATH,
+            "temp_dir": Config.TEMP_DIR,
+            "timeout_seconds": Config.COMPILE_TIMEOUT,
+        },
+    }
+)
 
 
 @app.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint to verify API is running."""
-    return (
-        jsonify(
+    return HEALTH_BODY, 200, JSON_HEADERS
+
+
+def build_compile_response(result):
+    """
+    Shape a CompilerInvoker result into the /compile API contract.
+
+    Args:
+        result: Dictionary returned by CompilerInvoker.compile
+
+    Returns:
+        Tuple of (response payload dict, HTTP status code)
+    """
+    # Check for timeout specifically
+    if (
+        result.get("return_code") == -1
+        and "timeout" in str(result.get("errors", [])).lower()
+    ):
+        # Compilation timeout - return 408
+        return (
             {
-                "status": "healthy",
-                "compiler_path": Config.COMPILER_PATH,
-                "compiler_exists": os.path.exists(Config.COMPILER_PATH),
-            }
-        ),
-        200,
+                "success": False,
+                "error": result.get("errors", ["Compilation timeout"])[0],
+                "logs": {
+                    "stdout": result.get("stdout", ""),
+                    "stderr": result.get("stderr", ""),
+                },
+            },
+            408,
+        )
+
+    # Transform result to match API contract
+    if result["success"]:
+        # Successful compilation
+        response = {
+            "success": True,
+            "tokens": raw_json(result.get("tokens")),
+            "ast": raw_json(result.get("ast")),
+            "assembly": result.get("assembly"),
+            "hexdump": result.get("hex"),
+            "logs": {
+                "stdout": result.get("stdout", ""),
+                "stderr": result.get("stderr", ""),
+            },
+        }
+        return response, 200
+    else:
+        # Compilation failed - return partial results with error
+        error_msg = (
+            result.get("errors", ["Unknown compilation error"])[0]
+            if result.get("errors")
+            else "Compilation failed"
+        )
+
+        response = {
+            "success": False,
+            "error": error_msg,
+            "tokens": raw_json(
+                result.get("tokens")
+            ),  # Partial result: may have tokens even if failed
+            "ast": raw_json(
+                result.get("ast")
+            ),  # Partial result: may have AST even if codegen failed
+            "assembly": result.get(
+                "assembly"
+            ),  # Partial result: may have assembly even if linking failed
+            "logs": {
+                "stdout": result.get("stdout", ""),
+                "stderr": result.get("stderr", ""),
+            },
+        }
+        return response, 400
+
+
+def source_etag(source_hash):
+    """Derive a compact ETag from the 128-bit or longer cache-key digest."""
+    return base64.urlsafe_b64encode(source_hash)[:22].decode()
+
+
+# Compiled bodies smaller than this are sent uncompressed
+GZIP_MIN_SIZE = 1024
+
+
+def gzip_body(body):
+    """Gzip a serialized /compile body, or return None if it is too small."""
+    if len(body) < GZIP_MIN_SIZE:
+        return None
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def accepts_gzip():
+    """Whether the current client accepts gzip-encoded responses."""
+    return request.accept_encodings["gzip"] > 0
+
+
+def representation_etag(etag, gzipped):
+    """Give the gzip-encoded form of a result its own strong ETag."""
+    return f"{etag}-gzip" if gzipped else etag
+
+
+def compiled_response(body, gzipped, status, cache_status, etag=None):
+    """
+    Wrap a serialized /compile body, tagging it with its cache status.
+
+    Successful results that are cached also carry an ETag, which clients can
+    send back in If-None-Match to revalidate without downloading the body.
+    The gzip-encoded body, when there is one, is sent to clients that accept
+    it; hex dumps and assembly listings compress by an order of magnitude.
+    """
+    use_gzip = gzipped is not None and accepts_gzip()
+    response = app.response_class(
+        gzipped if use_gzip else body, status=status, mimetype="application/json"
     )
+    response.headers["X-Cache"] = cache_status
+    response.vary.add("Accept-Encoding")
+    if use_gzip:
+        response.content_encoding = "gzip"
+    if etag and status == 200:
+        response.set_etag(representation_etag(etag, use_gzip))
+    return response
+
 
+@app.route("/compile", methods=["OPTIONS"])
+def compile_preflight():
+    """Answer CORS preflight requests for /compile without a body."""
+    return "", 204
 
-@app.route("/compile", methods=["POST"])
+
+@app.route("/compile", methods=["POST"], provide_automatic_options=False)
 def compile_code():
     """
     Compile C source code and return visualization data.
 
     Expected JSON payload:
     {
-        "source": "int main() { return 42; }"
+        "source": "int main() { return 42; }",
+        "options": {                # Optional
+            "dumps": ["tokens"]     # Subset of tokens/ast/assembly/hexdump
+        }
     }
 
+    Outputs left out of "dumps" are not generated and come back as null.
+
     Returns JSON with:
     Success Response:
     {
         "success": true,
-        "tokens": [...],        # Parsed from tokens.json
-        "ast": {...},           # Parsed from ast.json
+        "tokens": [...],        # Spliced verbatim from tokens.json
+        "ast": {...},           # Spliced verbatim from ast.json
         "assembly": "...",      # Raw assembly text
         "hexdump": "...",       # Raw hex string
         "logs": {
@@ -89,167 +410,133 @@ def compile_code():
     }
     """
     try:
+        # Reject oversized bodies from Content-Length before reading them
+        if (request.content_length or 0) > app.config["MAX_CONTENT_LENGTH"]:
+            return REQUEST_TOO_LARGE_BODY, 413, JSON_HEADERS
+
         # Parse request - Handle invalid JSON
-        data = request.get_json(force=False, silent=False)
+        # Decode the raw body with orjson rather than request.get_json()
+        raw = request.get_data(cache=False)
+        data = orjson.loads(raw) if raw else None
 
         if data is None:
-            return (
-                jsonify({"success": False, "error": "Invalid JSON in request body"}),
-                400,
-            )
+            return INVALID_JSON_BODY, 400, JSON_HEADERS
 
         if "source" not in data:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": 'Missing "source" field in request body',
-                    }
-                ),
-                400,
-            )
+            return MISSING_SOURCE_BODY, 400, JSON_HEADERS
 
         source_code = data["source"]
 
         # Validate source code is not empty
         if not source_code or not source_code.strip():
-            return (
-                jsonify({"success": False, "error": "Source code cannot be empty"}),
-                400,
-            )
+            return EMPTY_SOURCE_BODY, 400, JSON_HEADERS
 
         # Validate source code size
         if len(source_code) > Config.MAX_SOURCE_SIZE:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": f"Source code too large: {len(source_code)} bytes (max: {Config.MAX_SOURCE_SIZE} bytes)",
-                    }
-                ),
+            return error_response(
+                f"Source code too large: {len(source_code)} bytes (max: {Config.MAX_SOURCE_SIZE} bytes)",
                 400,
             )
 
-        # Invoke compiler with default filename
-        result = compiler.compile(source_code, filename="input.c")
-
-        # Check for timeout specifically
-        if (
-            result.get("return_code") == -1
-            and "timeout" in str(result.get("errors", [])).lower()
+        # Optional subset of outputs to generate, named as in the response
+        options = data.get("options")
+        if options is None:
+            options = {}
+        elif not isinstance(options, dict):
+            return error_response('"options" must be an object', 400)
+
+        dump_fields = options.get("dumps")
+        if dump_fields is None:
+            dumps = None
+        elif isinstance(dump_fields, list) and all(
+            isinstance(field, str) and field in DUMP_FIELDS for field in dump_fields
         ):
-            # Compilation timeout - return 408
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": result.get("errors", ["Compilation timeout"])[0],
-                        "logs": {
-                            "stdout": result.get("stdout", ""),
-                            "stderr": result.get("stderr", ""),
-                        },
-                    }
-                ),
-                408,
+            dumps = frozenset(DUMP_FIELDS[field] for field in dump_fields)
+        else:
+            return error_response(
+                f'"options.dumps" must be a list of: {", ".join(DUMP_FIELDS)}', 400
             )
 
-        # Transform result to match API contract
-        if result["success"]:
-            # Successful compilation
-            response = {
-                "success": True,
-                "tokens": result.get("tokens"),
-                "ast": result.get("ast"),
-                "assembly": result.get("assembly"),
-                "hexdump": result.get("hex"),
-                "logs": {
-                    "stdout": result.get("stdout", ""),
-                    "stderr": result.get("stderr", ""),
-                },
-            }
-            return jsonify(response), 200
-        else:
-            # Compilation failed - return partial results with error
-            error_msg = (
-                result.get("errors", ["Unknown compilation error"])[0]
-                if result.get("errors")
-                else "Compilation failed"
+        # Serve repeated submissions of the same request from the cache; keys
+        # and ETags include the compiler build, so a rebuild invalidates them
+        # The dumps selector is hashed before the user-controlled source so
+        # no source text can produce another request's key
+        compiler = get_compiler()
+        selector = "*" if dumps is None else ",".join(sorted(dumps))
+        digest = new_hash(compiler.build_id + b"\0" + selector.encode() + b"\0")
+        digest.update(source_code.encode())
+        source_hash = digest.digest()
+        etag = source_etag(source_hash)
+        cached = response_cache.get(source_hash)
+        if cached is not None:
+            body, gzipped, status = cached
+
+            # The client already holds this exact successful result
+            etag_sent = representation_etag(
+                etag, gzipped is not None and accepts_gzip()
             )
+            if status == 200 and request.if_none_match.contains(etag_sent):
+                response = app.response_class(status=304)
+                response.vary.add("Accept-Encoding")
+                response.set_etag(etag_sent)
+                return response
 
-            response = {
-                "success": False,
-                "error": error_msg,
-                "tokens": result.get(
-                    "tokens"
-                ),  # Partial result: may have tokens even if failed
-                "ast": result.get(
-                    "ast"
-                ),  # Partial result: may have AST even if codegen failed
-                "assembly": result.get(
-                    "assembly"
-                ),  # Partial result: may have assembly even if linking failed
-                "logs": {
-                    "stdout": result.get("stdout", ""),
-                    "stderr": result.get("stderr", ""),
-                },
-            }
-            return jsonify(response), 400
+            return compiled_response(body, gzipped, status, "HIT", etag)
 
-    except ValueError as e:
+        # Invoke compiler with default filename
+        result = compiler.compile(source_code, filename="input.c", dumps=dumps)
+        payload, status = build_compile_response(result)
+        body = orjson.dumps(payload)
+
+        # Cache compiler verdicts (success and failure), but not timeouts or
+        # unexpected invocation errors, which may not recur
+        if result.get("return_code") == -1:
+            gzipped = gzip_body(body) if accepts_gzip() else None
+            return compiled_response(body, gzipped, status, "MISS")
+
+        # Compress once here, so every cache hit can reuse the gzip form
+        gzipped = gzip_body(body)
+        response_cache.put(source_hash, body, status, gzipped)
+        return compiled_response(body, gzipped, status, "MISS", etag)
+
+    except RequestEntityTooLarge:
+        # Body exceeded MAX_CONTENT_LENGTH while streaming (no Content-Length)
+        return REQUEST_TOO_LARGE_BODY, 413, JSON_HEADERS
+
+    except orjson.JSONDecodeError as e:
         # Invalid JSON format
-        return (
-            jsonify(
-                {"success": False, "error": f"Invalid JSON in request body: {str(e)}"}
-            ),
-            400,
-        )
+        return error_response(f"Invalid JSON in request body: {str(e)}", 400)
 
     except FileNotFoundError as e:
         # Compiler binary not found
-        return (
-            jsonify(
-                {"success": False, "error": f"Compiler binary not found: {str(e)}"}
-            ),
-            500,
-        )
+        return error_response(f"Compiler binary not found: {str(e)}", 500)
 
     except Exception as e:
-        # Internal server error - log and return 500
-        import traceback
+        # Internal server error - log with traceback and return 500
+        logger.exception("Internal server error")
 
-        print(f"Internal server error: {str(e)}")
-        print(traceback.format_exc())
-
-        return (
-            jsonify({"success": False, "error": f"Internal server error: {str(e)}"}),
-            500,
-        )
+        return error_response(f"Internal server error: {str(e)}", 500)
 
 
 @app.route("/api/info", methods=["GET"])
 def api_info():
     """Get API information and configuration."""
-    return (
-        jsonify(
-            {
-                "name": "C Compiler Visualization API",
-                "version": "1.0.0",
-                "endpoints": {
-                    "/health": "GET - Health check",
-                    "/compile": "POST - Compile C code and get visualization data",
-                    "/api/info": "GET - API information",
-                },
-                "config": {
-                    "compiler_path": Config.COMPILER_PATH,
-                    "temp_dir": Config.TEMP_DIR,
-                    "timeout_seconds": Config.COMPILE_TIMEOUT,
-                },
-            }
-        ),
-        200,
-    )
+    return API_INFO_BODY, 200, JSON_HEADERS
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="C Compiler Visualization API")
+    parser.add_argument(
+        "--dev",
+        action="store_true",
+        help="Run the Flask development server (use gunicorn wsgi:app otherwise)",
+    )
+    args = parser.parse_args()
+
+    if not args.dev:
+        parser.error("production deployments should use: gunicorn wsgi:app")
+
     # Development server
     app.run(host=Config.HOST, port=Config.PORT, debug=Config.DEBUG)
@@ -5,9 +5,35 @@ This module contains all configuration settings for the API server,
 including paths, timeouts, and server settings.
 """
 
+import logging
 import os
+import tempfile
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+
+def _resolve_compiler(candidates, default):
+    """
+    Locate the compiler binary with a single stat call per candidate.
+
+    Args:
+        candidates: Paths to try, in order of preference
+        default: Path to report if no candidate exists
+
+    Returns:
+        Tuple of (path, exists, executable)
+    """
+    for candidate in candidates:
+        try:
+            st = os.stat(candidate)
+        except OSError:
+            # Missing, or unreachable (e.g. an unreadable bin/ directory)
+            continue
+        return candidate, True, bool(st.st_mode & 0o111)
+
+    return default, False, False
+
 
 class Config:
     """Configuration class for the API server."""
@@ -17,33 +43,48 @@ class Config:
 
     # Compiler settings
     import platform
-    import os as _os_check
 
     # Try to find the compiler binary (with or without .exe)
     COMPILER_EXE = "mycc.exe" if platform.system() == "Windows" else "mycc"
     COMPILER_PATH_WITH_EXE = str(PROJECT_ROOT / "bin" / "mycc.exe")
     COMPILER_PATH_NO_EXE = str(PROJECT_ROOT / "bin" / "mycc")
 
-    # Use the one that exists (handles Git Bash on Windows)
-    if _os_check.path.exists(COMPILER_PATH_WITH_EXE):
-        COMPILER_PATH = COMPILER_PATH_WITH_EXE
-    elif _os_check.path.exists(COMPILER_PATH_NO_EXE):
-        COMPILER_PATH = COMPILER_PATH_NO_EXE
-    else:
-        # Default to platform-specific name
-        COMPILER_PATH = str(PROJECT_ROOT / "bin" / COMPILER_EXE)
+    # Use the one that exists (handles Git Bash on Windows), otherwise
+    # default to the platform-specific name. Resolved once at import.
+    COMPILER_PATH, COMPILER_EXISTS, COMPILER_EXECUTABLE = _resolve_compiler(
+        (COMPILER_PATH_WITH_EXE, COMPILER_PATH_NO_EXE),
+        str(PROJECT_ROOT / "bin" / COMPILER_EXE),
+    )
 
     # Temporary file settings
-    TEMP_DIR = str(PROJECT_ROOT / "tmp")
+    # Prefer tmpfs (/dev/shm on Linux) so compiler dumps never touch disk
+    TEMP_DIR = os.getenv("MYCC_TMPDIR") or (
+        "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    )
+
+    # Persistent compile result cache (keyed by source and compiler build)
+    COMPILE_CACHE_DIR = os.getenv("MYCC_CACHE_DIR") or os.path.join(
+        tempfile.gettempdir(), "mycc_cache"
+    )
+    # Results kept on disk (and, separately, cached sources); each full
+    # result is about 50 KB, and the least recently used are pruned
+    COMPILE_CACHE_MAX_ENTRIES = int(os.getenv("MYCC_CACHE_MAX_ENTRIES", "2048"))
 
     # Compilation settings
     COMPILE_TIMEOUT = 30  # seconds
     MAX_SOURCE_SIZE = 100 * 1024  # 100KB max source code size
+    RESPONSE_CACHE_SIZE = 512  # Compiled responses kept in memory per worker
+
+    # Optional Redis cache shared across gunicorn workers (requires redis)
+    REDIS_URL = os.getenv("REDIS_URL")
+    REDIS_CACHE_TTL = 3600  # seconds
+    # Socket timeout for Redis; a slow or unreachable server counts as a miss
+    REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT", "0.5"))  # seconds
 
     # Flask server settings
     HOST = "0.0.0.0"  # Listen on all interfaces
     PORT = 5001  # Port 5000 is often used by AirPlay on macOS
-    DEBUG = True  # Enable debug mode for development
+    DEBUG = False  # Enable only for local development (python app.py --dev)
 
     # CORS settings
     # Development: Allow React dev server
@@ -51,8 +92,7 @@ class Config:
     import os as _os
 
     CORS_ORIGINS = _os.getenv("CORS_ORIGINS", "http://localhost:3000")
-    # To allow multiple origins in development:
-    # CORS_ORIGINS = ['http://localhost:3000', 'http://localhost:5173']
+    # A single origin is sent verbatim in Access-Control-Allow-Origin
     # To allow all origins (not recommended): CORS_ORIGINS = "*"
 
     # Logging
@@ -67,13 +107,13 @@ class Config:
             FileNotFoundError: If compiler binary doesn't exist
             ValueError: If configuration values are invalid
         """
-        if not os.path.exists(cls.COMPILER_PATH):
+        if not cls.COMPILER_EXISTS:
             raise FileNotFoundError(
                 f"Compiler not found at: {cls.COMPILER_PATH}\n"
                 f"Please build the compiler first with: make"
             )
 
-        if not os.access(cls.COMPILER_PATH, os.X_OK):
+        if not cls.COMPILER_EXECUTABLE:
             raise PermissionError(f"Compiler is not executable: {cls.COMPILER_PATH}")
 
         if cls.COMPILE_TIMEOUT <= 0:
@@ -85,6 +125,20 @@ class Config:
         if not (1024 <= cls.PORT <= 65535):
             raise ValueError("PORT must be between 1024 and 65535")
 
+    @classmethod
+    def compiler_exists(cls):
+        """
+        Check whether the compiler binary exists.
+
+        The answer comes from the stat performed when the class was defined,
+        since the binary is not expected to appear or disappear while the
+        server is running.
+
+        Returns:
+            True if COMPILER_PATH exists
+        """
+        return cls.COMPILER_EXISTS
+
     @classmethod
     def info(cls):
         """
@@ -96,7 +150,7 @@ class Config:
         return {
             "project_root": str(cls.PROJECT_ROOT),
             "compiler_path": cls.COMPILER_PATH,
-            "compiler_exists": os.path.exists(cls.COMPILER_PATH),
+            "compiler_exists": cls.compiler_exists(),
             "temp_dir": cls.TEMP_DIR,
             "compile_timeout": cls.COMPILE_TIMEOUT,
             "max_source_size": cls.MAX_SOURCE_SIZE,
@@ -110,5 +164,5 @@ if __name__ != "__main__":
     try:
         Config.validate()
     except Exception as e:
-        print(f"Warning: Configuration validation failed: {e}")
-        print("The API may not work correctly until the compiler is built.")
+        logger.warning("Configuration validation failed: %s", e)
+        logger.warning("The API may not work correctly until the compiler is built.")
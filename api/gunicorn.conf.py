@@ -0,0 +1,17 @@
+"""
+Gunicorn configuration for the Flask API Bridge
+
+/compile blocks on the mycc subprocess for up to COMPILE_TIMEOUT seconds,
+so throughput is bound by concurrency rather than Python CPU time. Run one
+process per core, each with a small pool of threads.
+"""
+
+import multiprocessing
+
+from config import Config
+
+bind = f"{Config.HOST}:{Config.PORT}"
+workers = multiprocessing.cpu_count()
+worker_class = "gthread"
+threads = 4
+timeout = 60
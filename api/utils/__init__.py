@@ -3,8 +3,10 @@ Utility modules for the C Compiler Visualization API.
 
 This package contains:
 - compiler.py: Compiler invocation and output parsing
+- cache.py: Memory + Redis cache of serialized compile responses
 """
 
-from .compiler import CompilerInvoker
+from .cache import ResponseCache
+from .compiler import CompilerInvoker, new_hash
 
-__all__ = ["CompilerInvoker"]
+__all__ = ["CompilerInvoker", "ResponseCache", "new_hash"]
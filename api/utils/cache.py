@@ -0,0 +1,153 @@
+"""
+Compilation Result Cache
+
+This module provides a two-tier cache that maps a digest of the compiler
+build and the submitted source code to the already-serialized (and, when
+large, gzip-compressed) /compile response, so repeated submissions skip
+the compiler subprocess entirely:
+
+1. A bounded, thread-safe in-memory LRU local to each worker process
+2. An optional Redis store shared by all workers (enabled by REDIS_URL)
+"""
+
+import logging
+import struct
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # Redis support is optional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Redis values are the HTTP status and body length, then the response body,
+# then its gzip-encoded form (empty if the body was not compressed)
+_HEADER = struct.Struct("!HI")
+
+# Prefix of Redis keys; bumped whenever the value layout changes
+_KEY_PREFIX = b"cc2:"
+
+# A cached response: (body, gzip-encoded body or None, HTTP status)
+Entry = Tuple[bytes, Optional[bytes], int]
+
+
+class ResponseCache:
+    """Two-tier (memory, then Redis) cache of serialized compile responses."""
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        redis_url: Optional[str] = None,
+        redis_ttl: int = 3600,
+        redis_timeout: float = 0.5,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of responses kept in memory before
+                evicting the least recently used entry
+            redis_url: Optional Redis URL for the shared second-level cache
+            redis_ttl: Expiry in seconds for entries stored in Redis
+            redis_timeout: Seconds to wait when connecting to or talking to
+                Redis before treating the operation as a miss
+        """
+        self.maxsize = maxsize
+        self.redis_url = redis_url
+        self.redis_ttl = redis_ttl
+        self.redis_timeout = redis_timeout
+        self._entries: "OrderedDict[bytes, Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+
+        if redis_url and redis is None:
+            logger.warning("REDIS_URL is set but the redis package is not installed")
+
+    def get(self, key: bytes) -> Optional[Entry]:
+        """
+        Look up a cached response, falling back to Redis on a memory miss.
+
+        Args:
+            key: Digest of the compiler build and source code
+
+        Returns:
+            Tuple of (response body, gzip-encoded body or None, HTTP
+            status), or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        client = self._redis_client()
+        if client is None:
+            return None
+
+        try:
+            value = client.get(_KEY_PREFIX + key)
+        except redis.RedisError as e:
+            logger.warning("Redis cache lookup failed: %s", e)
+            return None
+
+        if value is None:
+            return None
+
+        # Entries written by something else, or truncated, count as a miss
+        status, size = (
+            _HEADER.unpack_from(value) if len(value) > _HEADER.size else (0, 0)
+        )
+        end = _HEADER.size + size
+        if not 100 <= status <= 599 or size == 0 or end > len(value):
+            logger.warning("Ignoring malformed Redis cache entry")
+            return None
+
+        entry = (value[_HEADER.size : end], value[end:] or None, status)
+        self._remember(key, entry)
+        return entry
+
+    def put(
+        self, key: bytes, body: bytes, status: int, gzipped: Optional[bytes] = None
+    ) -> None:
+        """
+        Store a response in memory and, if configured, in Redis.
+
+        Args:
+            key: Digest of the compiler build and source code
+            body: Serialized JSON response body
+            status: HTTP status code of the response
+            gzipped: The body gzip-encoded, if it is worth compressing
+        """
+        self._remember(key, (body, gzipped, status))
+
+        client = self._redis_client()
+        if client is None:
+            return
+
+        try:
+            value = _HEADER.pack(status, len(body)) + body + (gzipped or b"")
+            client.setex(_KEY_PREFIX + key, self.redis_ttl, value)
+        except redis.RedisError as e:
+            logger.warning("Redis cache store failed: %s", e)
+
+    def _remember(self, key: bytes, entry: Entry) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entry if full."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _redis_client(self):
+        """Create the Redis client on first use; None if Redis is disabled."""
+        if self._redis is None and self.redis_url and redis is not None:
+            self._redis = redis.Redis.from_url(
+                self.redis_url,
+                decode_responses=False,
+                socket_timeout=self.redis_timeout,
+                socket_connect_timeout=self.redis_timeout,
+            )
+        return self._redis
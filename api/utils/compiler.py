@@ -7,52 +7,223 @@ This module handles:
 3. Reading and parsing all dump outputs
 4. Cleaning up temporary files
 5. Error handling and timeout management
+6. Caching results on disk, keyed by source content and compiler build
 """
 
+import functools
+import hashlib
+import itertools
+import logging
 import os
+import pickle
+import re
+import selectors
+import shutil
+import stat
 import subprocess
 import tempfile
-import json
+import threading
+import time
 import platform
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet, Iterable, Iterator, Optional, Tuple
+
+try:
+    import xxhash
+except ImportError:  # xxhash is optional; SHA-256 is used without it
+    xxhash = None
+
+logger = logging.getLogger(__name__)
+
+# Dumps mycc can produce, named after their keys in the result dictionary
+DUMP_KINDS: FrozenSet[str] = frozenset({"tokens", "ast", "assembly", "hex"})
+
+# Compiler flag and output file name for each dump kind, in command order
+_DUMP_OUTPUTS = (
+    ("tokens", "--dump-tokens", "tokens.json"),
+    ("ast", "--dump-ast", "ast.json"),
+    ("assembly", "--dump-asm", "assembly.s"),
+    ("hex", "--dump-hex", "executable.hex"),
+)
+
+# Dumps that mycc writes as JSON; the rest are plain text
+_JSON_DUMPS: FrozenSet[str] = frozenset({"tokens", "ast"})
+
+# Shared pool that overlaps the independent dump-file reads of each compile
+_io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mycc-io")
+
+# Deletes finished compiles' temporary directories off the request path
+_cleanup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mycc-cleanup")
+
+# Hash for cache keys, ETags and source file names (here and in the API).
+# Keys only need to be unique within this server's caches, not
+# collision-resistant against attackers.
+new_hash = xxhash.xxh3_128 if xxhash is not None else hashlib.sha256
+
+# Most compiler diagnostics kept per compile; a run that writes more is killed
+_STDERR_LIMIT = 1 << 20
+
+# A non-blank stderr line, starting at its first non-whitespace byte
+_ERR_RE = re.compile(rb"[^\s][^\n]*")
+
+
+@contextmanager
+def _scratch_dir(parent: Optional[str]) -> Iterator[str]:
+    """
+    Create a temporary directory that is deleted in the background.
+
+    Unlike tempfile.TemporaryDirectory, leaving the block does not wait for
+    the directory's files to be unlinked.
+
+    Args:
+        parent: Directory to create it in (None means the system default)
+
+    Yields:
+        Path of the new directory
+    """
+    path = tempfile.mkdtemp(dir=parent)
+    try:
+        yield path
+    finally:
+        _cleanup_pool.submit(shutil.rmtree, path, ignore_errors=True)
+
+
+@functools.lru_cache(maxsize=4)
+def _validate_compiler(compiler_path: str) -> Tuple[float, int]:
+    """
+    Check that the compiler exists and is executable, once per path.
+
+    Args:
+        compiler_path: Absolute path to the mycc compiler executable
+
+    Raises:
+        FileNotFoundError: If the compiler does not exist
+        PermissionError: If the compiler is not executable
+
+    Returns:
+        Tuple of (mtime, size) identifying this compiler build
+    """
+    try:
+        st = os.stat(compiler_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Compiler not found at: {compiler_path}") from None
+
+    if not os.access(compiler_path, os.X_OK):
+        raise PermissionError(f"Compiler not executable: {compiler_path}")
+
+    return st.st_mtime, st.st_size
 
 
 class CompilerInvoker:
     """Handles invocation of the mycc C compiler and collection of dump outputs."""
 
-    def __init__(self, compiler_path: str):
+    def __init__(
+        self,
+        compiler_path: str,
+        temp_dir: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_entries: int = 2048,
+    ):
         """
         Initialize the compiler invoker.
 
         Args:
             compiler_path: Absolute path to the mycc compiler executable
+            temp_dir: Parent directory for per-compile working directories
+                (None prefers tmpfs at /dev/shm, else the system default)
+            cache_dir: Directory for the persistent result cache
+                (None disables caching)
+            cache_max_entries: Results, and separately cached sources, kept
+                in cache_dir; the least recently used are pruned beyond this
         """
-        self.compiler_path = compiler_path
-
-        if not os.path.exists(compiler_path):
-            raise FileNotFoundError(f"Compiler not found at: {compiler_path}")
-
-        if not os.access(compiler_path, os.X_OK):
-            raise PermissionError(f"Compiler not executable: {compiler_path}")
+        # An absolute path lets subprocess use posix_spawn instead of fork+exec
+        self.compiler_path = os.path.abspath(compiler_path)
+
+        # Keep compiler I/O off the block layer when tmpfs is available
+        if temp_dir is None and os.access("/dev/shm", os.W_OK):
+            temp_dir = "/dev/shm"
+        self.temp_dir = temp_dir
+
+        # Cache entries, here and in the API's response cache, are tied to
+        # this exact compiler build
+        mtime, size = _validate_compiler(self.compiler_path)
+        self.build_id = f"{self.compiler_path}\0{mtime}\0{size}".encode()
+        self._cache_dir = self._prepare_cache_dir(cache_dir) if cache_dir else None
+        self._cache_max_entries = cache_max_entries
+        # Prune after every this many stores, so the cache overshoots its
+        # bound by at most this much between prunes
+        self._prune_interval = max(1, cache_max_entries // 16)
+        self._stores = itertools.count(1)
+        if self._cache_dir is not None:
+            _cleanup_pool.submit(self._prune_cache)
+
+        # Remove TMPDIR from the compiler's environment to prevent path
+        # doubling. The compiler's getTempFileName() prepends $TMPDIR, but we
+        # provide absolute paths for all dumps. If TMPDIR points to a temp
+        # directory and we pass absolute paths from that same directory, we
+        # get doubled paths like: /tmp/xxx//tmp/xxx/file.s
+        # Built once; changes to os.environ after startup are not picked up.
+        self._child_env = {k: v for k, v in os.environ.items() if k != "TMPDIR"}
+
+        # Compiles currently running, keyed by cache key, so that concurrent
+        # identical requests share a single subprocess
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Everything about the command line that does not vary per compile
+        self._cmd_prefix = (self.compiler_path,)
+        # Add .exe on Windows for consistency
+        self._exe_name = "output.exe" if platform.system() == "Windows" else "output"
+        # ARM64 Macs can't assemble x86-64, so they never produce a hex dump
+        self._can_assemble = not (
+            platform.system() == "Darwin" and platform.machine() == "arm64"
+        )
+
+        # Command-line plan for every subset of DUMP_KINDS (16 of them)
+        self._compile_variants = self._build_variants()
+
+        spawn = getattr(subprocess, "_USE_POSIX_SPAWN", False)
+        logger.info("Launching compiler via %s", "posix_spawn" if spawn else "fork")
 
     def compile(
-        self, source_code: str, filename: str = "input.c", timeout: int = 30
+        self,
+        source_code: str,
+        filename: str = "input.c",
+        timeout: int = 30,
+        dumps: Optional[Iterable[str]] = None,
     ) -> Dict[str, Any]:
         """
-        Compile C source code and collect all visualization dumps.
+        Compile C source code and collect the requested visualization dumps.
+
+        Results are served from the on-disk cache when the same source was
+        already compiled by the same compiler build. Timeouts and unexpected
+        errors are never cached. Callers that ask for a compile identical to
+        one already running wait for it and receive the same result
+        dictionary, which must therefore be treated as read-only.
+
+        Safe to call from multiple threads: each compile uses its own
+        temporary directory, and the GIL is released while waiting on the
+        compiler, so threaded servers (gunicorn's gthread workers) run
+        compiles in parallel.
 
         Args:
             source_code: C source code as string
             filename: Name for the temporary source file
             timeout: Compilation timeout in seconds
+            dumps: Subset of DUMP_KINDS to produce (None means all of them);
+                dumps that are not requested are None in the result
+
+        Raises:
+            ValueError: If dumps contains an unknown dump kind
 
         Returns:
             Dictionary containing:
             {
                 "success": bool,
-                "tokens": dict or None,
-                "ast": dict or None,
+                "tokens": bytes or None,  # raw JSON from tokens.json
+                "ast": bytes or None,     # raw JSON from ast.json
                 "assembly": str or None,
                 "hex": str or None,
                 "errors": list of str,
@@ -60,87 +231,142 @@ class CompilerInvoker:
                 "stderr": str
             }
         """
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # File paths
-            source_file = temp_path / filename
-            tokens_file = temp_path / "tokens.json"
-            ast_file = temp_path / "ast.json"
-            assembly_file = temp_path / "assembly.s"
-            hex_file = temp_path / "executable.hex"
-            # Define output executable name (add .exe on Windows for consistency)
-            exe_name = "output.exe" if platform.system() == "Windows" else "output"
-            output_exe = temp_path / exe_name
-
-            # Write source code to file
-            source_file.write_text(source_code)
-
-            # Detect if we're on ARM64 Mac (can't assemble x86-64)
-            # In this case, skip hex dump since assembly will fail
-            is_arm64_mac = (
-                platform.system() == "Darwin" and platform.machine() == "arm64"
+        dumps = DUMP_KINDS if dumps is None else frozenset(dumps)
+        unknown = dumps - DUMP_KINDS
+        if unknown:
+            raise ValueError(f"Unknown dump kinds: {', '.join(sorted(unknown))}")
+
+        cache_key = self._cache_key(source_code, filename, dumps)
+        with self._inflight_lock:
+            pending = self._inflight.get(cache_key)
+            if pending is None:
+                future = self._inflight[cache_key] = Future()
+        if pending is not None:
+            return pending.result()
+
+        try:
+            result = self._compile_cached(
+                cache_key, source_code, filename, timeout, dumps
             )
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+
+    def _compile_cached(
+        self,
+        cache_key: str,
+        source_code: str,
+        filename: str,
+        timeout: int,
+        dumps: FrozenSet[str],
+    ) -> Dict[str, Any]:
+        """
+        Serve a compile from the disk cache, running mycc on a miss.
 
-            # Build compiler command with absolute paths
-            cmd = [
-                self.compiler_path,
-                str(source_file),
-                "--dump-tokens",
-                str(tokens_file),
-                "--dump-ast",
-                str(ast_file),
-                "--dump-asm",
-                str(assembly_file),
-            ]
-
-            # Only request hex dump on platforms that can assemble x86-64
-            # (Windows, Linux x86-64, or Intel Mac)
-            if not is_arm64_mac:
-                cmd.extend(["--dump-hex", str(hex_file)])
-                cmd.extend(["-o", str(output_exe)])
-            else:
-                # On ARM64 Mac, stop at assembly stage (-S flag)
-                cmd.append("-S")
+        Args:
+            cache_key: Key returned by _cache_key for these arguments
+            source_code: C source code as string
+            filename: Name for the temporary source file
+            timeout: Compilation timeout in seconds
+            dumps: Subset of DUMP_KINDS to produce
 
-            # Execute compiler
-            # Remove TMPDIR from environment to prevent path doubling
-            # The compiler's getTempFileName() prepends $TMPDIR, but we're providing
-            # absolute paths for all dumps. If TMPDIR points to a temp directory
-            # and we pass absolute paths from that same temp directory, we get
-            # doubled paths like: /tmp/xxx//tmp/xxx/file.s
-            # Solution: Remove TMPDIR so compiler uses /tmp as default
-            try:
-                env = os.environ.copy()
-                if "TMPDIR" in env:
-                    del env["TMPDIR"]  # Let compiler use default /tmp
+        Returns:
+            Result dictionary as described in compile()
+        """
+        if self._cache_dir is None:
+            return self._run_compiler(source_code, filename, timeout, dumps)
 
-                result = subprocess.run(
-                    cmd, capture_output=True, text=True, timeout=timeout, env=env
-                )
+        cache_file = self._cache_dir / f"{cache_key}.pkl"
+        cached = self._load_cached(cache_file)
+        if cached is not None:
+            return cached
 
-                # Parse outputs
-                tokens = self._read_json_file(tokens_file)
-                ast = self._read_json_file(ast_file)
-                assembly = self._read_text_file(assembly_file)
+        result = self._run_compiler(source_code, filename, timeout, dumps)
+        if result["return_code"] != -1:
+            self._store_cached(cache_file, result)
+            if next(self._stores) % self._prune_interval == 0:
+                _cleanup_pool.submit(self._prune_cache)
 
-                # Hex dump only available on platforms that can assemble x86-64
-                if is_arm64_mac:
-                    hex_dump = None  # Not available on ARM64 Mac
-                else:
-                    if hex_file.exists():
-                        hex_dump = self._read_text_file(hex_file)
-                    else:
-                        # Debug: List files to understand why hex dump failed
-                        print(f"Debug: Hex file missing. Temp dir contents: {[str(p.name) for p in temp_path.glob('*')]}")
-                        hex_dump = None
+        return result
+
+    def _run_compiler(
+        self, source_code: str, filename: str, timeout: int, dumps: FrozenSet[str]
+    ) -> Dict[str, Any]:
+        """
+        Invoke mycc on the source and collect its dumps (uncached).
+
+        Args:
+            source_code: C source code as string
+            filename: Name for the temporary source file
+            timeout: Compilation timeout in seconds
+            dumps: Dump kinds to request from the compiler
+
+        Returns:
+            Result dictionary in the format documented on compile()
+        """
+        # Each call gets its own directory, so parallel compiles never collide
+        with _scratch_dir(self.temp_dir) as temp_dir:
+            # Write source code to file (reused across identical compiles)
+            source_file = self._write_source(source_code, filename, Path(temp_dir))
+
+            # Dump flags, output files and readers for this dump subset
+            outputs, stop_flags, output_name = self._compile_variants[dumps]
+            want_hex = self._can_assemble and "hex" in dumps
+
+            # Build compiler command with absolute paths
+            cmd = [*self._cmd_prefix, str(source_file)]
+            reads = []
+            for kind, flag, file_name, read in outputs:
+                path = os.path.join(temp_dir, file_name)
+                cmd += (flag, path)
+                reads.append((kind, read, path))
+            cmd += (*stop_flags, "-o", os.path.join(temp_dir, output_name))
+
+            # Execute compiler
+            try:
+                returncode, stderr_bytes = self._spawn_compiler(cmd, timeout)
+                if not source_file.exists():
+                    # The cached source a symlink pointed at was pruned; retry
+                    # from a private copy rather than report a bogus failure
+                    source_file.unlink()
+                    source_file.write_text(source_code)
+                    returncode, stderr_bytes = self._spawn_compiler(cmd, timeout)
+                stderr = stderr_bytes.decode("utf-8", errors="replace")
+
+                # Read requested outputs concurrently; file reads release the GIL
+                futures = [
+                    (kind, _io_pool.submit(read, path)) for kind, read, path in reads
+                ]
+                contents = {kind: future.result() for kind, future in futures}
+                tokens = contents.get("tokens")
+                ast = contents.get("ast")
+                assembly = contents.get("assembly")
+                hex_dump = contents.get("hex")  # Not available on ARM64 Mac
+
+                if want_hex and hex_dump is None:
+                    # Debug: List files to understand why hex dump failed
+                    logger.debug(
+                        "Hex file missing. Temp dir contents: %s",
+                        os.listdir(temp_dir),
+                    )
 
                 # Determine success
                 # On ARM64 Mac, success means tokens + AST + assembly were generated
-                success = result.returncode == 0
+                success = returncode == 0
 
                 # Collect errors from stderr
-                errors = self._parse_errors(result.stderr)
+                errors = self._parse_errors(stderr_bytes)
+                if len(stderr_bytes) >= _STDERR_LIMIT:
+                    errors.append(
+                        f"Compiler output exceeded {_STDERR_LIMIT} bytes; "
+                        "compilation aborted"
+                    )
 
                 return {
                     "success": success,
@@ -149,9 +375,9 @@ class CompilerInvoker:
                     "assembly": assembly,
                     "hex": hex_dump,
                     "errors": errors,
-                    "stdout": result.stdout,
-                    "stderr": result.stderr,
-                    "return_code": result.returncode,
+                    "stdout": "",  # mycc only writes its usage text to stdout
+                    "stderr": stderr,
+                    "return_code": returncode,
                 }
 
             except subprocess.TimeoutExpired:
@@ -180,26 +406,329 @@ class CompilerInvoker:
                     "return_code": -1,
                 }
 
-    def _read_json_file(self, filepath: Path) -> Optional[Dict]:
+    def _build_variants(self) -> Dict[FrozenSet[str], tuple]:
+        """
+        Precompute the compiler invocation for each subset of DUMP_KINDS.
+
+        Returns:
+            Mapping of dump subset to (outputs, stop_flags, output_name),
+            where outputs lists (kind, flag, file name, reader) per dump to
+            request, stop_flags ends compilation early and output_name is
+            the file passed to -o
+        """
+        variants = {}
+        for size in range(len(DUMP_KINDS) + 1):
+            for combo in itertools.combinations(sorted(DUMP_KINDS), size):
+                dumps = frozenset(combo)
+
+                # Only request hex dump on platforms that can assemble x86-64
+                # (Windows, Linux x86-64, or Intel Mac)
+                want_hex = self._can_assemble and "hex" in dumps
+
+                outputs = tuple(
+                    (kind, flag, file_name, self._reader_for(kind))
+                    for kind, flag, file_name in _DUMP_OUTPUTS
+                    if kind in dumps and (kind != "hex" or want_hex)
+                )
+                if want_hex:
+                    variants[dumps] = (outputs, (), self._exe_name)
+                else:
+                    # Without a hex dump there is no need to assemble and
+                    # link, so stop at the assembly stage (-S)
+                    variants[dumps] = (outputs, ("-S",), "output.s")
+        return variants
+
+    def _reader_for(self, kind: str):
+        """Return the method that reads the dump file of the given kind."""
+        return self._read_json_file if kind in _JSON_DUMPS else self._read_text_file
+
+    def _spawn_compiler(self, cmd: list, timeout: int) -> Tuple[int, bytes]:
+        """
+        Run the compiler, capturing at most _STDERR_LIMIT bytes of stderr.
+
+        stdout is discarded. A compiler that writes more than the limit to
+        stderr is killed rather than left blocked on a full pipe.
+
+        Args:
+            cmd: Compiler command line
+            timeout: Seconds to wait before killing the compiler
+
+        Raises:
+            subprocess.TimeoutExpired: If the compiler ran past the timeout
+
+        Returns:
+            Tuple of (return code, captured stderr bytes)
+        """
+        deadline = time.monotonic() + timeout
+
+        # close_fds=False (Python fds are non-inheritable anyway) and no
+        # preexec_fn keep subprocess on its posix_spawn fast path, avoiding
+        # a fork() that copies the worker's page tables
+        with subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            env=self._child_env,
+            close_fds=False,
+        ) as proc:
+            try:
+                if os.name == "nt":
+                    # Windows pipes cannot be polled; read it all, then trim
+                    stderr = proc.communicate(timeout=timeout)[1][:_STDERR_LIMIT]
+                else:
+                    stderr = self._read_stderr(proc, deadline)
+                returncode = proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                raise subprocess.TimeoutExpired(cmd, timeout) from None
+
+        return returncode, stderr
+
+    def _read_stderr(self, proc: subprocess.Popen, deadline: float) -> bytes:
         """
-        Read and parse a JSON file.
+        Read the compiler's stderr until EOF, the size limit or the deadline.
+
+        Waiting on the pipe against the deadline keeps the timeout a hard
+        bound even when a process mycc started (sh, as, ld) still holds the
+        pipe open.
+
+        Args:
+            proc: Running compiler process
+            deadline: time.monotonic() value at which to give up
+
+        Raises:
+            subprocess.TimeoutExpired: If the deadline passed first
+
+        Returns:
+            Captured stderr bytes; the compiler is killed if it hit the limit
+        """
+        fd = proc.stderr.fileno()
+        chunks = []
+        size = 0
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while size < _STDERR_LIMIT:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise subprocess.TimeoutExpired(proc.args, remaining)
+                chunk = os.read(fd, min(1 << 16, _STDERR_LIMIT - size))
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+                size += len(chunk)
+
+        proc.kill()
+        return b"".join(chunks)
+
+    def _prepare_cache_dir(self, cache_dir: str) -> Optional[Path]:
+        """
+        Create the cache directory, refusing one that others could write to.
+
+        Cache entries are unpickled, so the directory must be private to the
+        current user.
+
+        Args:
+            cache_dir: Directory for the persistent result cache
+
+        Returns:
+            Path to the usable cache directory, or None to disable caching
+        """
+        path = Path(cache_dir)
+        try:
+            path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            st = path.stat()
+        except OSError as e:
+            logger.warning("Compile cache disabled, cannot create %s: %s", path, e)
+            return None
+
+        owner_ok = not hasattr(os, "getuid") or st.st_uid == os.getuid()
+        if not owner_ok or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            logger.warning("Compile cache disabled, %s is not private", path)
+            return None
+
+        return path
+
+    def _write_source(self, source_code: str, filename: str, temp_path: Path) -> Path:
+        """
+        Write the source file, reusing an identical copy from earlier compiles.
+
+        With a cache directory, sources are stored content-addressed under it
+        so repeat compiles of the same code read a file that is already in
+        the page cache instead of writing a new one. The compiler is always
+        given a path inside the per-compile temporary directory (a hard link
+        or, across filesystems, a symlink to the cached copy), because mycc
+        names its intermediate .s and .o files after the source path.
+
+        Args:
+            source_code: C source code as string
+            filename: Name for the source file (shown in compiler messages)
+            temp_path: Per-compile temporary directory
+
+        Returns:
+            Path of the source file to pass to the compiler
+        """
+        source_file = temp_path / filename
+
+        if self._cache_dir is not None:
+            source_hash = new_hash(source_code.encode()).hexdigest()
+            cached_file = self._cache_dir / "src" / source_hash
+            try:
+                try:
+                    # Refresh the mtime so cache pruning sees it as recent
+                    os.utime(cached_file)
+                except FileNotFoundError:
+                    # Write under a temporary name and rename, so concurrent
+                    # compiles never see a partially written file
+                    cached_file.parent.mkdir(exist_ok=True)
+                    with tempfile.NamedTemporaryFile(
+                        "w", dir=cached_file.parent, suffix=".tmp", delete=False
+                    ) as f:
+                        f.write(source_code)
+                    os.replace(f.name, cached_file)
+                try:
+                    # A hard link keeps the file alive even if it is pruned
+                    os.link(cached_file, source_file)
+                except OSError:
+                    # Different filesystem, or links unsupported
+                    os.symlink(cached_file, source_file)
+                return source_file
+            except OSError as e:
+                logger.warning("Failed to reuse cached source %s: %s", cached_file, e)
+
+        source_file.write_text(source_code)
+        return source_file
+
+    def _cache_key(
+        self, source_code: str, filename: str, dumps: FrozenSet[str]
+    ) -> str:
+        """
+        Derive the cache key for a compile request.
+
+        Args:
+            source_code: C source code as string
+            filename: Name for the temporary source file
+            dumps: Dump kinds requested from the compiler
+
+        Returns:
+            Hex digest over the compiler build, options and source code
+        """
+        digest = new_hash()
+        digest.update(self.build_id + b"\0")
+        digest.update(f"{filename}\0{','.join(sorted(dumps))}\0".encode())
+        digest.update(source_code.encode())
+        return digest.hexdigest()
+
+    def _load_cached(self, cache_file: Path) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached compile result.
+
+        Args:
+            cache_file: Path to the cache entry
+
+        Returns:
+            Cached result dictionary, or None on a miss or unreadable entry
+        """
+        try:
+            with open(cache_file, "rb") as f:
+                result = pickle.load(f)
+            # Refresh the mtime so pruning keeps recently used entries
+            os.utime(cache_file)
+            return result
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", cache_file, e)
+            return None
+
+    def _store_cached(self, cache_file: Path, result: Dict[str, Any]) -> None:
+        """
+        Atomically write a compile result to the cache.
+
+        Args:
+            cache_file: Path to the cache entry
+            result: Result dictionary returned by _run_compiler()
+        """
+        try:
+            with tempfile.NamedTemporaryFile(
+                dir=self._cache_dir, suffix=".tmp", delete=False
+            ) as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f.name, cache_file)
+        except OSError as e:
+            logger.warning("Failed to write cache entry %s: %s", cache_file, e)
+
+    def _prune_cache(self) -> None:
+        """
+        Delete the least recently used cache entries beyond the size bound.
+
+        Results (*.pkl) and cached sources (src/*) are bounded separately.
+        """
+        self._prune_dir(self._cache_dir, ".pkl")
+        # Older versions stored each source in its own directory
+        self._prune_dir(self._cache_dir / "src", "", remove_dirs=True)
+
+    def _prune_dir(self, directory: Path, suffix: str, remove_dirs=False) -> None:
+        """
+        Keep the cache_max_entries most recently modified files in directory.
+
+        Args:
+            directory: Directory to prune
+            suffix: Only files ending in suffix are cache entries; in-progress
+                *.tmp writes are never touched
+            remove_dirs: Also delete every subdirectory
+        """
+        entries = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if remove_dirs:
+                                shutil.rmtree(entry.path, ignore_errors=True)
+                            continue
+                        if entry.name.endswith(".tmp"):
+                            continue
+                        if entry.name.endswith(suffix):
+                            entries.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue  # Removed concurrently by another worker
+        except OSError:
+            return
+
+        entries.sort()
+        for _, path in entries[: max(0, len(entries) - self._cache_max_entries)]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Failed to prune cache entry %s: %s", path, e)
+
+    def _read_json_file(self, filepath: str) -> Optional[bytes]:
+        """
+        Read a JSON dump without parsing it.
+
+        The compiler already emits valid JSON, so the bytes are passed through
+        to the API response as-is instead of being decoded and re-encoded.
 
         Args:
             filepath: Path to JSON file
 
         Returns:
-            Parsed JSON as dict, or None if file doesn't exist or is invalid
+            Raw JSON bytes, or None if file doesn't exist or is empty
         """
         try:
-            if filepath.exists():
-                with open(filepath, "r") as f:
-                    return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Failed to read JSON file {filepath}: {e}")
+            with open(filepath, "rb", buffering=0) as f:
+                return f.read() or None
+        except FileNotFoundError:
+            pass
+        except IOError as e:
+            logger.warning("Failed to read JSON file %s: %s", filepath, e)
 
         return None
 
-    def _read_text_file(self, filepath: Path) -> Optional[str]:
+    def _read_text_file(self, filepath: str) -> Optional[str]:
         """
         Read a text file.
 
@@ -210,27 +739,28 @@ class CompilerInvoker:
             File contents as string, or None if file doesn't exist
         """
         try:
-            if filepath.exists():
-                return filepath.read_text()
-        except IOError as e:
-            print(f"Warning: Failed to read text file {filepath}: {e}")
+            # Unbuffered binary read plus a single decode avoids the text
+            # layer's incremental decoding of large hex dumps
+            with open(filepath, "rb", buffering=0) as f:
+                return f.read().decode()
+        except FileNotFoundError:
+            pass
+        except (IOError, UnicodeDecodeError) as e:
+            logger.warning("Failed to read text file %s: %s", filepath, e)
 
         return None
 
-    def _parse_errors(self, stderr: str) -> list:
+    def _parse_errors(self, stderr: bytes) -> list:
         """
         Parse compiler error messages from stderr.
 
         Args:
-            stderr: Standard error output from compiler
+            stderr: Raw standard error output from compiler
 
         Returns:
-            List of error message strings
+            List of non-empty, stripped error message strings
         """
-        if not stderr.strip():
-            return []
-
-        # Split by lines and filter out empty lines
-        errors = [line.strip() for line in stderr.split("\n") if line.strip()]
-
-        return errors
+        return [
+            m.group().rstrip().decode("utf-8", errors="replace")
+            for m in _ERR_RE.finditer(stderr)
+        ]
@@ -0,0 +1,13 @@
+"""
+WSGI Entry Point for the Flask API Bridge
+
+Production servers import the application from here, e.g.:
+
+    gunicorn wsgi:app
+
+Worker settings are read from gunicorn.conf.py in this directory.
+"""
+
+from app import app
+
+__all__ = ["app"]